@@ -5,14 +5,25 @@ Handles location data with varying levels of specificity
 Includes automatic directional offset calculation
 """
 
+import asyncio
+import numpy as np
 import pandas as pd
-import requests
-import time
+import aiohttp
+import diskcache
+import orjson
+import hashlib
+import random
 import re
-import math
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
 import sys
 
+# Optional: numba JIT-compiles the offset math (falls back to NumPy without it)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION - EDIT THESE VALUES
 # ============================================================================
@@ -30,46 +41,138 @@ OUTPUT_FILE = "geocoded_locations.csv" # Path for output file
 
 # API configuration
 GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
-RATE_LIMIT_DELAY = 0.1  # seconds between requests (Google allows ~50 requests/sec)
+RATE_LIMIT_DELAY = 0.02  # seconds between request starts (Google allows ~50 requests/sec)
+MAX_CONCURRENT_REQUESTS = 50  # requests allowed in flight at once
+MAX_RETRIES = 5  # retries on OVER_QUERY_LIMIT/server errors before giving up on an address
+RETRY_MAX_DELAY = 32  # longest backoff between retries (seconds); starts at 1s and doubles
+RETRY_HTTP_STATUSES = (500, 502, 503, 504)  # server errors worth retrying
+CHUNK_SIZE = 500  # rows geocoded and written to the output file at a time
+
+# Columns filled in by this script (every other column is copied from the input)
+RESULT_COLUMNS = [
+    'latitude', 'longitude', 'geocoded_address', 'google_formatted_address', 'location_type',
+    'flag_status', 'flag_reason', 'latitude_shifted', 'longitude_shifted', 'offset_applied'
+]
+
+# Geocode cache - successful lookups are reused across runs
+CACHE_DIR = ".geocode_cache"
+CACHE_EXPIRE = 86400 * 180  # seconds to keep cached results (Google TOS allows caching up to ~6 months)
+CACHE = diskcache.Cache(CACHE_DIR)
 
+# ============================================================================
+# LOCATION TEXT PATTERNS AND LOOKUP TABLES (regexes compiled once, case-insensitive)
 # ============================================================================
 
-def construct_address(row: pd.Series) -> Optional[str]:
-    """
-    Construct an address string from available location data.
-    Prioritizes more specific location information.
+# Directional offset prefix, removed before geocoding the base location
+# Matches "5mi NW of ", "5 miles west of "
+BASE_LOCATION_PATTERN = re.compile(
+    r'\d+\.?\d*\s*mi[les]*\s+(?:[NSEW]{1,3}|north|south|east|west|ne|nw|se|sw)\s+of\s+', re.IGNORECASE
+)
+
+# Directional offsets, capturing (distance, direction)
+# Matches "5mi NW of", "5 miles west of"
+OFFSET_PATTERN = re.compile(
+    r'(\d+\.?\d*)\s*mi[les]*\s+([NSEW]{1,3}|north|south|east|west|ne|nw|se|sw)\s+of', re.IGNORECASE
+)
+
+# Convert spelled-out directions to abbreviations
+DIRECTION_ABBREVIATIONS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW'
+}
+
+# Convert direction to bearing (degrees from North, clockwise)
+DIRECTION_BEARINGS = {
+    'N': 0, 'NNE': 22.5, 'NE': 45, 'ENE': 67.5,
+    'E': 90, 'ESE': 112.5, 'SE': 135, 'SSE': 157.5,
+    'S': 180, 'SSW': 202.5, 'SW': 225, 'WSW': 247.5,
+    'W': 270, 'WNW': 292.5, 'NW': 315, 'NNW': 337.5
+}
+
+# State abbreviation mapping, for checking Google's formatted address
+STATE_ABBREV = {
+    'alabama': 'al', 'alaska': 'ak', 'arizona': 'az', 'arkansas': 'ar',
+    'california': 'ca', 'colorado': 'co', 'connecticut': 'ct', 'delaware': 'de',
+    'florida': 'fl', 'georgia': 'ga', 'hawaii': 'hi', 'idaho': 'id',
+    'illinois': 'il', 'indiana': 'in', 'iowa': 'ia', 'kansas': 'ks',
+    'kentucky': 'ky', 'louisiana': 'la', 'maine': 'me', 'maryland': 'md',
+    'massachusetts': 'ma', 'michigan': 'mi', 'minnesota': 'mn', 'mississippi': 'ms',
+    'missouri': 'mo', 'montana': 'mt', 'nebraska': 'ne', 'nevada': 'nv',
+    'new hampshire': 'nh', 'new jersey': 'nj', 'new mexico': 'nm', 'new york': 'ny',
+    'north carolina': 'nc', 'north dakota': 'nd', 'ohio': 'oh', 'oklahoma': 'ok',
+    'oregon': 'or', 'pennsylvania': 'pa', 'rhode island': 'ri', 'south carolina': 'sc',
+    'south dakota': 'sd', 'tennessee': 'tn', 'texas': 'tx', 'utah': 'ut',
+    'vermont': 'vt', 'virginia': 'va', 'washington': 'wa', 'west virginia': 'wv',
+    'wisconsin': 'wi', 'wyoming': 'wy'
+}
+
+# Issue flagging patterns - one alternation per family, so each is a single pass over the text
+# Directional offsets: "5mi NW of", "10 mi E", "5 miles west of"
+DIRECTIONAL_FLAG_PATTERN = re.compile(
+    r'\d+\.?\d*\s*mi[les]*\s+(?:[NSEW]{1,3}\s+of|[NSEW]{1,3}$|(?:north|south|east|west|ne|nw|se|sw)\s+of)',
+    re.IGNORECASE
+)
+VAGUE_REF_PATTERN = re.compile(r'\b(?:behind|at|vic\.?|near)\b', re.IGNORECASE)
+WATER_FEATURE_PATTERN = re.compile(
+    r'\b(?:river|lake|creek|bay|beach|shore|falls|pond)\b', re.IGNORECASE
+)
+PARK_KEYWORD_PATTERN = re.compile(
+    r'\b(?:park|forest|wilderness|preserve|refuge|national|state park|grove|seashore|monument|station|dunes)\b',
+    re.IGNORECASE
+)
+PARENTHETICAL_PATTERN = re.compile(r'[()\[\]]')
+
+# ============================================================================
+
+def read_input_csv(input_file: str) -> pd.DataFrame:
     """
-    parts = []
-    
-    # Add precise location if available
-    if pd.notna(row.get('prec_location')) and str(row['prec_location']).strip():
-        parts.append(str(row['prec_location']).strip())
-    
-    # Add city
-    if pd.notna(row.get('city')) and str(row['city']).strip():
-        parts.append(str(row['city']).strip())
-    
-    # Add county
-    if pd.notna(row.get('county')) and str(row['county']).strip():
-        county = str(row['county']).strip()
-        if not county.lower().endswith('county'):
-            county = county + " County"
-        parts.append(county)
-    
-    # Add state/province
-    if pd.notna(row.get('province_state')) and str(row['province_state']).strip():
-        parts.append(str(row['province_state']).strip())
+    Read a CSV into Arrow-backed columns.
     
-    # Add country if available (default to USA if not specified)
-    if pd.notna(row.get('country')) and str(row['country']).strip():
-        parts.append(str(row['country']).strip())
-    else:
-        # Default to USA for US states
-        parts.append("USA")
+    The pyarrow engine rejects rows with fewer fields than the header, so
+    those files are re-read with the default engine (missing fields become empty).
+    """
+    try:
+        return pd.read_csv(input_file, engine='pyarrow', dtype_backend='pyarrow')
+    except pd.errors.ParserError:
+        return pd.read_csv(input_file).convert_dtypes(dtype_backend='pyarrow')
+
+def column_text(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Get a column as stripped strings, with "" for missing values.
+    Returns all "" if the column doesn't exist.
+    """
+    if column not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[column].astype("string[pyarrow]").fillna("").str.strip()
+
+def construct_addresses(df: pd.DataFrame) -> pd.Series:
+    """
+    Construct address strings from available location data for every row.
+    Prioritizes more specific location information.
     
-    if parts:
-        return ", ".join(parts)
-    return None
+    Returns:
+        Series of addresses aligned with df (None where there is no data)
+    """
+    # Add county, with a "County" suffix if it's missing
+    county = column_text(df, 'county')
+    needs_suffix = (county != "") & ~county.str.lower().str.endswith('county')
+    county = county.where(~needs_suffix, county + " County")
+    
+    # Default to USA if country is not specified
+    country = column_text(df, 'country')
+    country = country.where(country != "", "USA")
+    
+    # precise location, city, county, state/province, country
+    parts = np.column_stack([
+        column_text(df, 'prec_location').to_numpy(dtype=object),
+        column_text(df, 'city').to_numpy(dtype=object),
+        county.to_numpy(dtype=object),
+        column_text(df, 'province_state').to_numpy(dtype=object),
+        country.to_numpy(dtype=object),
+    ])
+    
+    addresses = [", ".join(part for part in row_parts if part) or None for row_parts in parts]
+    return pd.Series(addresses, index=df.index, dtype=object)
 
 def extract_base_location(address: str) -> str:
     """
@@ -83,40 +186,23 @@ def extract_base_location(address: str) -> str:
     if not address:
         return address
     
-    # Patterns that indicate directional offset
-    directional_patterns = [
-        r'\d+\.?\d*\s*mi[les]*\s+[NSEW]{1,3}\s+of\s+',  # "5mi NW of "
-        r'\d+\.?\d*\s*mi[les]*\s+(north|south|east|west|ne|nw|se|sw)\s+of\s+',  # "5 miles west of "
-    ]
-    
-    for pattern in directional_patterns:
-        match = re.search(pattern, address, re.IGNORECASE)
-        if match:
-            # Remove everything up to and including "of "
-            base_location = address[match.end():]
-            return base_location.strip()
+    match = BASE_LOCATION_PATTERN.search(address)
+    if match:
+        # Remove everything up to and including "of "
+        base_location = address[match.end():]
+        return base_location.strip()
     
     # No directional offset found, return original
     return address
 
-def geocode_address_google(address: str, api_key: str) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+def parse_geocode_response(data: dict, address: str) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
     """
-    Geocode an address using Google's Geocoding API.
+    Extract coordinates from a decoded Google Geocoding API response.
     
     Returns:
         Tuple of (latitude, longitude, location_type, formatted_address)
     """
-    params = {
-        "address": address,
-        "key": api_key
-    }
-    
     try:
-        response = requests.get(GOOGLE_GEOCODE_URL, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
         if data.get("status") == "OK" and data.get("results"):
             # Get the first (best) result
             result = data["results"][0]
@@ -134,7 +220,7 @@ def geocode_address_google(address: str, api_key: str) -> Tuple[Optional[float],
             return lat, lon, location_type, formatted_address
             
         elif data.get("status") == "ZERO_RESULTS":
-            print(f"  📍 No results found for this address")
+            print(f"  📍 No results found for '{address}'")
             return None, None, None, None
             
         elif data.get("status") == "REQUEST_DENIED":
@@ -143,281 +229,597 @@ def geocode_address_google(address: str, api_key: str) -> Tuple[Optional[float],
             return None, None, None, None
             
         elif data.get("status") == "OVER_QUERY_LIMIT":
-            print(f"  ⚠️  Query limit exceeded - slow down requests")
+            print(f"  ⚠️  Query limit exceeded for '{address}' - slow down requests")
             return None, None, None, None
             
         else:
-            print(f"  ⚠️  API returned status: {data.get('status')}")
+            print(f"  ⚠️  API returned status {data.get('status')} for '{address}'")
             return None, None, None, None
             
-    except requests.exceptions.RequestException as e:
-        print(f"  ❌ Request error: {e}")
-        return None, None, None, None
     except (KeyError, ValueError) as e:
-        print(f"  ❌ Error parsing response: {e}")
+        print(f"  ❌ Error parsing response for '{address}': {e}")
         return None, None, None, None
 
-def parse_directional_offset(text: str) -> Tuple[Optional[float], Optional[float]]:
+def cache_key(address: str) -> str:
+    """
+    Build the geocode cache key for an address.
+    Addresses differing only in case or surrounding whitespace share a key.
+    """
+    return hashlib.sha1(address.strip().lower().encode()).hexdigest()
+
+def retry_delay(attempt: int) -> float:
+    """
+    Seconds to wait before retry number attempt (0-based): exponential
+    backoff capped at RETRY_MAX_DELAY, plus up to 1s of jitter.
+    """
+    return min(2 ** attempt, RETRY_MAX_DELAY) + random.random()
+
+async def geocode_address_google_async(session: aiohttp.ClientSession, address: str, api_key: str) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
     """
-    Parse directional offset from text like "5mi NW of X" or "50 mi WSW of Y"
+    Geocode an address using Google's Geocoding API without blocking.
+    
+    Retries with exponential backoff when Google reports OVER_QUERY_LIMIT
+    or UNKNOWN_ERROR (or HTTP 429/5xx), up to MAX_RETRIES times.
     
     Returns:
-        Tuple of (distance_miles, bearing_degrees) or (None, None)
+        Tuple of (latitude, longitude, location_type, formatted_address)
     """
-    if not text:
-        return None, None
-    
-    # Pattern to match various directional formats
-    patterns = [
-        r'(\d+\.?\d*)\s*mi[les]*\s+([NSEW]{1,3})\s+of',  # "5mi NW of"
-        r'(\d+\.?\d*)\s*mi[les]*\s+(north|south|east|west|ne|nw|se|sw)\s+of',  # "5 miles west of"
-    ]
+    params = {
+        "address": address,
+        "key": api_key
+    }
     
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            distance = float(match.group(1))
-            direction = match.group(2).upper()
-            
-            # Convert spelled-out directions to abbreviations
-            direction_map = {
-                'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
-                'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW'
-            }
-            direction = direction_map.get(direction, direction)
-            
-            # Convert direction to bearing (degrees from North, clockwise)
-            direction_bearings = {
-                'N': 0, 'NNE': 22.5, 'NE': 45, 'ENE': 67.5,
-                'E': 90, 'ESE': 112.5, 'SE': 135, 'SSE': 157.5,
-                'S': 180, 'SSW': 202.5, 'SW': 225, 'WSW': 247.5,
-                'W': 270, 'WNW': 292.5, 'NW': 315, 'NNW': 337.5
-            }
-            
-            bearing = direction_bearings.get(direction)
-            if bearing is not None:
-                return distance, bearing
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.get(GOOGLE_GEOCODE_URL, params=params,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 429:
+                    data = {"status": "OVER_QUERY_LIMIT"}
+                elif response.status in RETRY_HTTP_STATUSES:
+                    data = {"status": "UNKNOWN_ERROR"}
+                else:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"  ❌ Request error for '{address}': {e}")
+            return None, None, None, None
+        except ValueError as e:
+            print(f"  ❌ Error parsing response for '{address}': {e}")
+            return None, None, None, None
+        
+        if data.get("status") not in ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR") or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(retry_delay(attempt))
     
-    return None, None
+    return parse_geocode_response(data, address)
 
-def apply_offset(lat: float, lon: float, distance_miles: float, bearing_degrees: float) -> Tuple[float, float]:
+async def geocode_addresses_google(session: aiohttp.ClientSession, addresses: List[str], api_key: str) -> List[Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]]:
     """
-    Calculate new lat/lon given a starting point, distance, and bearing.
+    Geocode many addresses concurrently over session.
     
-    Uses the Haversine formula to calculate the destination point.
+    Duplicate addresses (compared by cache_key, so case and surrounding
+    whitespace don't matter) are only requested once, and addresses already in
+    CACHE are not requested at all. Request starts are spaced RATE_LIMIT_DELAY
+    apart to stay under Google's per-second limit, and at most
+    MAX_CONCURRENT_REQUESTS are in flight.
     
-    Args:
-        lat: Starting latitude (degrees)
-        lon: Starting longitude (degrees)
-        distance_miles: Distance to travel (miles)
-        bearing_degrees: Direction to travel (0-360, where 0=North, 90=East, clockwise)
+    Returns:
+        List of (latitude, longitude, location_type, formatted_address) tuples,
+        in the same order as addresses
+    """
+    # Results are keyed by cache_key, like CACHE itself
+    results = {}
+    to_request = {}
+    for address in addresses:
+        key = cache_key(address)
+        if key in results or key in to_request:
+            continue
+        cached = CACHE.get(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            to_request[key] = address
+    
+    print(f"  💾 {len(results)} cached, {len(to_request)} to request")
+    
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def geocode_one(position: int, address: str):
+        # Rate limiting: stagger request starts
+        await asyncio.sleep(position * RATE_LIMIT_DELAY)
+        async with sem:
+            return await geocode_address_google_async(session, address, api_key)
+    
+    fetched = await asyncio.gather(*(geocode_one(i, address) for i, address in enumerate(to_request.values())))
+    
+    for key, result in zip(to_request, fetched):
+        results[key] = result
+        if result[0] is not None:
+            CACHE.set(key, result, expire=CACHE_EXPIRE)
+    
+    return [results[cache_key(address)] for address in addresses]
+
+def parse_directional_offsets(text: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Parse directional offsets from text like "5mi NW of X" or "50 mi WSW of Y"
     
     Returns:
-        Tuple of (new_lat, new_lon)
+        Tuple of (distance_miles, bearing_degrees) float Series aligned with text,
+        NaN where no offset was found
+    """
+    extracted = text.fillna("").astype(str).str.extract(OFFSET_PATTERN.pattern, flags=OFFSET_PATTERN.flags, expand=True)
+    distances = pd.to_numeric(extracted[0], errors='coerce').astype(float)
+    directions = extracted[1].str.upper().replace(DIRECTION_ABBREVIATIONS)
+    bearings = directions.map(DIRECTION_BEARINGS).astype(float)
+    
+    # An offset needs both a distance and a recognized direction
+    has_offset = distances.notna() & bearings.notna()
+    return distances.where(has_offset), bearings.where(has_offset)
+
+def haversine_destination(lat: Union[float, np.ndarray], lon: Union[float, np.ndarray],
+                          distance_miles: Union[float, np.ndarray],
+                          bearing_degrees: Union[float, np.ndarray]) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+    """
+    Destination-point calculation behind apply_offset.
+    Written with np.* ufuncs, so the same code handles scalars (JIT-compiled
+    with numba when it's installed) and NumPy arrays (element-wise).
     """
     # Earth's radius in miles
-    R = 3959
+    R = 3959.0
     
     # Convert to radians
-    lat_rad = math.radians(lat)
-    lon_rad = math.radians(lon)
-    bearing_rad = math.radians(bearing_degrees)
+    lat_rad = np.radians(lat)
+    lon_rad = np.radians(lon)
+    bearing_rad = np.radians(bearing_degrees)
     
     # Distance as angular distance
     distance_rad = distance_miles / R
     
     # Calculate new position using forward azimuth formula
-    new_lat_rad = math.asin(
-        math.sin(lat_rad) * math.cos(distance_rad) +
-        math.cos(lat_rad) * math.sin(distance_rad) * math.cos(bearing_rad)
+    new_lat_rad = np.arcsin(
+        np.sin(lat_rad) * np.cos(distance_rad) +
+        np.cos(lat_rad) * np.sin(distance_rad) * np.cos(bearing_rad)
     )
     
-    new_lon_rad = lon_rad + math.atan2(
-        math.sin(bearing_rad) * math.sin(distance_rad) * math.cos(lat_rad),
-        math.cos(distance_rad) - math.sin(lat_rad) * math.sin(new_lat_rad)
+    new_lon_rad = lon_rad + np.arctan2(
+        np.sin(bearing_rad) * np.sin(distance_rad) * np.cos(lat_rad),
+        np.cos(distance_rad) - np.sin(lat_rad) * np.sin(new_lat_rad)
     )
     
     # Convert back to degrees
-    new_lat = math.degrees(new_lat_rad)
-    new_lon = math.degrees(new_lon_rad)
+    return np.degrees(new_lat_rad), np.degrees(new_lon_rad)
+
+if NUMBA_AVAILABLE:
+    haversine_destination_jit = njit(cache=True, fastmath=True)(haversine_destination)
+    
+    @njit(cache=True, fastmath=True, parallel=True)
+    def haversine_destinations(lats: np.ndarray, lons: np.ndarray, distances_miles: np.ndarray,
+                               bearings_degrees: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched haversine_destination over float64 arrays, in parallel across cores.
+        """
+        new_lats = np.empty(lats.shape[0])
+        new_lons = np.empty(lats.shape[0])
+        for i in prange(lats.shape[0]):
+            new_lats[i], new_lons[i] = haversine_destination_jit(lats[i], lons[i], distances_miles[i], bearings_degrees[i])
+        return new_lats, new_lons
+
+def apply_offset(lat: Union[float, np.ndarray], lon: Union[float, np.ndarray],
+                 distance_miles: Union[float, np.ndarray],
+                 bearing_degrees: Union[float, np.ndarray]) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+    """
+    Calculate new lat/lon given a starting point, distance, and bearing.
     
-    return new_lat, new_lon
+    Uses the Haversine formula to calculate the destination point.
+    Accepts scalars or NumPy arrays; arrays are shifted element-wise.
+    
+    Args:
+        lat: Starting latitude (degrees)
+        lon: Starting longitude (degrees)
+        distance_miles: Distance to travel (miles)
+        bearing_degrees: Direction to travel (0-360, where 0=North, 90=East, clockwise)
+    
+    Returns:
+        Tuple of (new_lat, new_lon)
+    """
+    if np.ndim(lat) == 0:
+        if NUMBA_AVAILABLE:
+            return haversine_destination_jit(float(lat), float(lon), float(distance_miles), float(bearing_degrees))
+        return haversine_destination(float(lat), float(lon), float(distance_miles), float(bearing_degrees))
+    
+    lats, lons, distances, bearings = (
+        np.asarray(values, dtype=np.float64) for values in (lat, lon, distance_miles, bearing_degrees)
+    )
+    if NUMBA_AVAILABLE:
+        return haversine_destinations(lats, lons, distances, bearings)
+    return haversine_destination(lats, lons, distances, bearings)
+
+def contains(text: pd.Series, pattern: re.Pattern) -> np.ndarray:
+    """
+    Check each value of text against a compiled regex pattern.
+    Returns a boolean array, True where the pattern matches.
+    
+    The pattern is passed as a string, since Arrow-backed strings on
+    pandas 2.x can't take a compiled re.Pattern.
+    """
+    ignore_case = bool(pattern.flags & re.IGNORECASE)
+    return text.str.contains(pattern.pattern, case=not ignore_case, regex=True, na=False).to_numpy(dtype=bool)
 
-def flag_potential_issues(row: pd.Series) -> Tuple[str, str]:
+def flag_potential_issues(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
     """
-    Analyze a location record and flag potential geocoding issues.
+    Analyze all location records and flag potential geocoding issues.
     
     Returns:
-        Tuple of (flag_status, flag_reason)
+        Tuple of (flag_status, flag_reason) Series aligned with df
         flag_status: "OK", "REVIEW", "WARNING"
     """
-    flags = []
-    
     # Get location components
-    has_city = pd.notna(row.get('city')) and str(row['city']).strip()
-    has_prec_location = pd.notna(row.get('prec_location')) and str(row['prec_location']).strip()
-    has_county = pd.notna(row.get('county')) and str(row['county']).strip()
-    has_state = pd.notna(row.get('province_state')) and str(row['province_state']).strip()
+    prec_loc_text = column_text(df, 'prec_location')
+    city_text = column_text(df, 'city')
+    county_text = column_text(df, 'county')
+    
+    has_city = (city_text != "").to_numpy()
+    has_prec_location = (prec_loc_text != "").to_numpy()
+    has_county = (county_text != "").to_numpy()
+    has_state = (column_text(df, 'province_state') != "").to_numpy()
     
     # Get text to analyze
-    prec_loc_text = str(row.get('prec_location', '')).strip()
-    city_text = str(row.get('city', '')).strip()
-    location_text = (prec_loc_text + ' ' + city_text).lower()
+    location_text = (prec_loc_text + ' ' + city_text).str.lower()
+    
+    # Each flag is a boolean array over all rows, in the order flags are reported
+    flags = {}
     
     # === CRITICAL FLAGS (WARNING level) ===
     
     # Flag 1: County/State only (too vague)
-    if not has_city and not has_prec_location:
-        flags.append("County/state only - very vague")
+    flags["County/state only - very vague"] = ~has_city & ~has_prec_location
     
     # Flag 2: Missing state (ambiguous)
-    if not has_state:
-        flags.append("Missing state - may be ambiguous")
+    flags["Missing state - may be ambiguous"] = ~has_state
     
     # Note: Single word locations are OK if they have state context (which they should)
     
     # === MODERATE FLAGS (REVIEW level) ===
     
     # Flag 4: Directional descriptions with distance
-    if has_prec_location:
-        # Matches patterns like "5mi NW of", "10 mi E", "3.5mi S of"
-        directional_patterns = [
-            r'\d+\.?\d*\s*mi[les]*\s+[NSEW]{1,3}\s+of',  # "5mi NW of"
-            r'\d+\.?\d*\s*mi[les]*\s+[NSEW]{1,3}$',      # "10 mi E"
-            r'\d+\.?\d*\s*mi[les]*\s+(north|south|east|west|ne|nw|se|sw)\s+of',  # "5 miles west of"
-        ]
-        if any(re.search(pattern, location_text) for pattern in directional_patterns):
-            flags.append("Directional offset - API may ignore distance/direction")
+    # Matches patterns like "5mi NW of", "10 mi E", "3.5mi S of"
+    is_directional = has_prec_location & contains(location_text, DIRECTIONAL_FLAG_PATTERN)
+    flags["Directional offset - API may ignore distance/direction"] = is_directional
     
     # Flag 5: "Behind/At/Vic./Near" vague reference points
-    if has_prec_location:
-        vague_refs = [r'\bbehind\b', r'\bat\b', r'\bvic\.?\b', r'\bnear\b']
-        if any(re.search(pattern, location_text) for pattern in vague_refs):
-            flags.append("Vague reference point (behind/at/vic/near)")
+    is_vague = has_prec_location & contains(location_text, VAGUE_REF_PATTERN)
+    flags["Vague reference point (behind/at/vic/near)"] = is_vague
     
     # Flag 6: Water features (may use centroid)
-    if has_prec_location or has_city:
-        water_features = [
-            r'\briver\b', r'\blake\b', r'\bcreek\b', r'\bbay\b', 
-            r'\bbeach\b', r'\bshore\b', r'\bfalls\b', r'\bpond\b'
-        ]
-        if any(re.search(pattern, location_text) for pattern in water_features):
-            flags.append("Water feature - may use centerline/centroid")
+    is_water = (has_prec_location | has_city) & contains(location_text, WATER_FEATURE_PATTERN)
+    flags["Water feature - may use centerline/centroid"] = is_water
     
     # Flag 7: Park/wilderness area names
-    park_keywords = [
-        r'\bpark\b', r'\bforest\b', r'\bwilderness\b', r'\bpreserve\b', 
-        r'\brefuge\b', r'\bnational\b', r'\bstate park\b', r'\bgrove\b', 
-        r'\bseashore\b', r'\bmonument\b', r'\bstation\b', r'\bdunes\b'
-    ]
-    if any(re.search(pattern, location_text) for pattern in park_keywords):
-        # Check if it's detailed or just park name
-        word_count = len(location_text.split())
-        if word_count <= 3:
-            flags.append("Park/natural area (just name - may use geometric center)")
-        else:
-            flags.append("Park/natural area with detail (may still use center)")
+    is_park = contains(location_text, PARK_KEYWORD_PATTERN)
+    # Check if it's detailed or just park name
+    is_short = (location_text.str.split().str.len() <= 3).to_numpy()
+    flags["Park/natural area (just name - may use geometric center)"] = is_park & is_short
+    flags["Park/natural area with detail (may still use center)"] = is_park & ~is_short
     
     # Flag 8: Multiple counties (ambiguous)
-    if has_county:
-        county_text = str(row['county'])
-        if '/' in county_text or ' or ' in county_text.lower():
-            flags.append("Multiple counties listed")
+    is_multi_county = (
+        county_text.str.contains('/', regex=False) |
+        county_text.str.lower().str.contains(' or ', regex=False)
+    ).to_numpy()
+    flags["Multiple counties listed"] = has_county & is_multi_county
     
     # Flag 9: Abbreviated location names
-    if has_prec_location:
-        # Very short with periods (I.S.B, Vic., etc.)
-        if len(prec_loc_text) <= 6 and '.' in prec_loc_text:
-            flags.append("Abbreviated location name")
-        # All caps short acronym
-        elif len(prec_loc_text) <= 4 and prec_loc_text.isupper() and not prec_loc_text.isdigit():
-            flags.append("Possible acronym/abbreviation")
+    # Very short with periods (I.S.B, Vic., etc.)
+    prec_len = prec_loc_text.str.len().to_numpy()
+    is_abbreviated = has_prec_location & (prec_len <= 6) & prec_loc_text.str.contains('.', regex=False).to_numpy()
+    flags["Abbreviated location name"] = is_abbreviated
+    # All caps short acronym
+    flags["Possible acronym/abbreviation"] = (
+        has_prec_location & ~is_abbreviated & (prec_len <= 4) &
+        prec_loc_text.str.isupper().to_numpy() & ~prec_loc_text.str.isdigit().to_numpy()
+    )
     
     # Flag 10: Parenthetical/bracketed information
-    if has_prec_location:
-        if '(' in prec_loc_text or '[' in prec_loc_text or ')' in prec_loc_text or ']' in prec_loc_text:
-            flags.append("Contains parenthetical info - may confuse geocoder")
-    
-    # === POSITIVE INDICATORS (good for accuracy) ===
-    
-    # Highway references (usually good)
-    if has_prec_location:
-        highway_patterns = [
-            r'highway\s+\d+', r'hwy\.?\s+\d+', r'hy\.\s+\d+', 
-            r'route\s+\d+', r'rt\.?\s+\d+', r'us-\d+', r'i-\d+'
-        ]
-        if any(re.search(pattern, location_text) for pattern in highway_patterns):
-            # This is actually good, but note it
-            pass  # Don't flag as negative
-    
-    # Detailed location (comma-separated, many words)
-    if has_prec_location:
-        if ',' in prec_loc_text and len(prec_loc_text.split()) >= 4:
-            # This is good! Don't add negative flags
-            pass
+    is_parenthetical = has_prec_location & contains(prec_loc_text, PARENTHETICAL_PATTERN)
+    flags["Contains parenthetical info - may confuse geocoder"] = is_parenthetical
+    
+    # Highway references and detailed comma-separated descriptions are good
+    # for accuracy, so they are never flagged
     
     # === DETERMINE OVERALL FLAG STATUS ===
     
-    if not flags:
-        return "OK", ""
+    labels = list(flags)
+    flag_matrix = np.column_stack([flags[label] for label in labels])
+    flag_reason = ["; ".join(label for label, hit in zip(labels, row_flags) if hit) for row_flags in flag_matrix]
     
     # Count severity
-    critical_keywords = ["county/state only", "missing state"]
-    moderate_keywords = ["directional offset", "vague reference", "just name"]
-    
-    has_critical = any(any(keyword in flag.lower() for keyword in critical_keywords) for flag in flags)
-    
-    # WARNING: Only critical issues
-    if has_critical:
-        return "WARNING", "; ".join(flags)
-    
-    # REVIEW: Multiple issues OR high-risk single issue
-    # But NOT for informational flags like parks/water features alone
-    if len(flags) >= 2:
-        # Check if all flags are just informational (parks, water, parenthetical)
-        informational_only = all(
-            any(keyword in flag.lower() for keyword in ['park', 'water feature', 'parenthetical'])
-            for flag in flags
-        )
-        if informational_only:
-            return "OK", "; ".join(flags)
-        else:
-            return "REVIEW", "; ".join(flags)
-    elif len(flags) == 1:
-        flag = flags[0].lower()
-        # Only flag as REVIEW if it's a concerning issue
-        if "directional offset" in flag or "vague reference" in flag or "abbreviated" in flag:
-            return "REVIEW", "; ".join(flags)
-        # Single informational flags (park, water feature, parenthetical) -> OK but still shown
+    flag_count = flag_matrix.sum(axis=1)
+    has_critical = flags["County/state only - very vague"] | flags["Missing state - may be ambiguous"]
+    # Informational flags (parks, water features, parenthetical) don't warrant REVIEW alone
+    informational_count = (
+        is_park.astype(int) + is_water.astype(int) + is_parenthetical.astype(int)
+    )
+    # Only flag a single issue as REVIEW if it's a concerning issue
+    is_concerning = is_directional | is_vague | is_abbreviated
+    
+    flag_status = np.select(
+        [
+            flag_count == 0,
+            # WARNING: Only critical issues
+            has_critical,
+            # REVIEW: Multiple issues, unless all are informational
+            (flag_count >= 2) & (informational_count == flag_count),
+            flag_count >= 2,
+            # REVIEW: High-risk single issue
+            is_concerning,
+        ],
+        ["OK", "WARNING", "OK", "REVIEW", "REVIEW"],
+        default="OK",
+    )
+    
+    return pd.Series(flag_status, index=df.index), pd.Series(flag_reason, index=df.index)
+
+async def geocode_rows(df: pd.DataFrame, rows: pd.Index, session: aiohttp.ClientSession, api_key: str) -> Tuple[int, int, int]:
+    """
+    Geocode the given rows of df in place, applying directional offsets
+    and post-geocoding flags.
+    
+    Returns:
+        Tuple of (geocoded_count, skipped_vague, failed_count)
+    """
+    geocoded_count = 0
+    skipped_vague = 0
+    failed_count = 0
+    
+    # Skip rows that are too vague (county/state only) - for ~20mi accuracy
+    # (10mi radius), we need at least city-level data
+    candidates = df.loc[rows]
+    too_vague = (column_text(candidates, 'city') == "") & (column_text(candidates, 'prec_location') == "")
+    for idx in candidates.index[too_vague]:
+        print(f"\n⏭️  Row {idx}: Skipping (too vague - county/state only)")
+    skipped_vague += int(too_vague.sum())
+    candidates = candidates[~too_vague]
+    
+    # Construct addresses
+    addresses = construct_addresses(candidates)
+    for idx in addresses.index[addresses.isna()]:
+        print(f"\n⏭️  Row {idx}: Skipping (no address data)")
+    skipped_vague += int(addresses.isna().sum())
+    addresses = addresses.dropna()
+    
+    # Extract base locations (remove directional offset for geocoding) and
+    # group rows that share one, so each unique base location is geocoded once
+    base_addresses = addresses.map(extract_base_location)
+    rows_by_base_address = base_addresses.groupby(base_addresses, sort=False).groups
+    
+    # Geocode the unique base locations concurrently
+    print(f"\n🌐 Geocoding {len(rows_by_base_address)} unique addresses for {len(addresses)} rows...")
+    results = await geocode_addresses_google(session, list(rows_by_base_address), api_key)
+    result_by_base_address = dict(zip(rows_by_base_address, results))
+    
+    # Broadcast each base location's result to all of its rows
+    for base_address, idxs in rows_by_base_address.items():
+        lat, lon, location_type, formatted_address = result_by_base_address[base_address]
+        if lat and lon:
+            df.loc[idxs, ['latitude', 'longitude', 'location_type', 'google_formatted_address']] = [
+                lat, lon, location_type, formatted_address
+            ]
+    
+    is_geocoded = np.array([
+        bool(result_by_base_address[base_address][0] and result_by_base_address[base_address][1])
+        for base_address in base_addresses
+    ], dtype=bool)
+    geocoded_idx = addresses.index[is_geocoded]
+    df.loc[geocoded_idx, 'geocoded_address'] = addresses[geocoded_idx]
+    
+    # Check geocoded rows for directional offsets and shift them all at once
+    distances, bearings = parse_directional_offsets(column_text(df.loc[geocoded_idx], 'prec_location'))
+    has_offset = distances.notna()
+    shifted_idx = geocoded_idx[has_offset.to_numpy()]
+    
+    lats_shifted, lons_shifted = apply_offset(
+        df.loc[shifted_idx, 'latitude'].to_numpy(dtype=float),
+        df.loc[shifted_idx, 'longitude'].to_numpy(dtype=float),
+        distances[shifted_idx].to_numpy(),
+        bearings[shifted_idx].to_numpy(),
+    )
+    df.loc[shifted_idx, ['latitude_shifted', 'longitude_shifted']] = np.column_stack([lats_shifted, lons_shifted])
+    df.loc[shifted_idx, 'offset_applied'] = [
+        f"{distance}mi at {bearing:g}°"
+        for distance, bearing in zip(distances[shifted_idx], bearings[shifted_idx])
+    ]
+    
+    # Collect per-row flag updates, then write them to the DataFrame in bulk
+    flagged_idx, flag_statuses, flag_reasons = [], [], []
+    
+    # Process each row's result
+    for idx, address in addresses.items():
+        row = df.loc[idx]
+        base_address = base_addresses[idx]
+        lat, lon, location_type, formatted_address = result_by_base_address[base_address]
+        
+        print(f"\n🔍 Row {idx}: Geocoding '{address}'")
+        if base_address != address:
+            print(f"  📍 Extracted base location: '{base_address}'")
+        
+        if lat and lon:
+            if has_offset[idx]:
+                print(f"  🧭 Directional offset detected: {row['offset_applied']} bearing")
+                print(f"     Base coords: {lat:.6f}, {lon:.6f}")
+                print(f"     Shifted coords: {row['latitude_shifted']:.6f}, {row['longitude_shifted']:.6f}")
+            
+            # Add post-geocoding flags
+            post_flags = []
+            
+            # Only flag GEOMETRIC_CENTER (not APPROXIMATE - that's very common and fine)
+            if location_type == "GEOMETRIC_CENTER":
+                post_flags.append("Geometric center of area")
+            
+            # Check if Google returned a very different location
+            if formatted_address:
+                formatted_lower = formatted_address.lower()
+                
+                # Check if state matches (if we have one)
+                if pd.notna(row.get('province_state')):
+                    expected_state = str(row['province_state']).strip()
+                    expected_state_lower = expected_state.lower()
+                    
+                    # Check if either full name or abbreviation appears in result
+                    state_found = (
+                        expected_state_lower in formatted_lower or
+                        STATE_ABBREV.get(expected_state_lower, '') in formatted_lower
+                    )
+                    
+                    if expected_state and not state_found:
+                        post_flags.append(f"State mismatch (expected {expected_state})")
+                
+                # Check if country is unexpected
+                if 'india' in formatted_lower or 'uk' in formatted_lower or 'canada' in formatted_lower:
+                    if 'usa' not in formatted_lower and 'united states' not in formatted_lower:
+                        post_flags.append("UNEXPECTED COUNTRY - verify result!")
+            
+            # Update flags if we found post-geocoding issues
+            if post_flags:
+                existing_flags = row['flag_reason']
+                if existing_flags:
+                    flag_reason = existing_flags + "; " + "; ".join(post_flags)
+                else:
+                    flag_reason = "; ".join(post_flags)
+                
+                # Upgrade status if we found serious issues
+                flag_status = row['flag_status']
+                if any("UNEXPECTED COUNTRY" in f or "State mismatch" in f for f in post_flags):
+                    flag_status = "WARNING"
+                elif flag_status == "OK":
+                    flag_status = "REVIEW"
+                
+                flagged_idx.append(idx)
+                flag_statuses.append(flag_status)
+                flag_reasons.append(flag_reason)
+            
+            print(f"  ✅ Success: {lat}, {lon}")
+            print(f"  📍 Google says: {formatted_address}")
+            print(f"  🎯 Accuracy: {location_type}")
+            if post_flags:
+                print(f"  🚩 Post-geocoding flags: {'; '.join(post_flags)}")
+            geocoded_count += 1
         else:
-            return "OK", "; ".join(flags)
+            print(f"  ❌ Failed to geocode")
+            failed_count += 1
+    
+    df.loc[flagged_idx, 'flag_status'] = flag_statuses
+    df.loc[flagged_idx, 'flag_reason'] = flag_reasons
+    
+    return geocoded_count, skipped_vague, failed_count
+
+def normalize_result_columns(df: pd.DataFrame) -> None:
+    """
+    Add any missing RESULT_COLUMNS to df and give all of them writable dtypes.
     
-    return "OK", "; ".join(flags)
+    Coordinates become plain float64 (geocoded coordinates aren't truncated
+    to an all-integer column's type, and unparseable values become NaN, which
+    isna() catches). Text columns become object, since an all-empty column is
+    read as null[pyarrow], which rejects any write.
+    """
+    coordinate_columns = ['latitude', 'longitude', 'latitude_shifted', 'longitude_shifted']
+    for column in RESULT_COLUMNS:
+        if column in coordinate_columns:
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64').copy()
+            else:
+                df[column] = np.nan
+        elif column in df.columns:
+            df[column] = df[column].astype(object)
+        else:
+            df[column] = ''
 
-def should_geocode(row: pd.Series) -> bool:
+def load_completed_rows(df: pd.DataFrame, output_file: str) -> int:
     """
-    Determine if a row needs geocoding.
-    Returns True if latitude or longitude is missing.
+    Load rows already written by an interrupted run into df.
+    
+    Only resumes when output_file has the same columns as df, fewer rows, and
+    the same input values as the start of df (a finished or unrelated output
+    file is overwritten as usual).
+    
+    Returns:
+        Number of leading rows already completed (0 if not resuming)
     """
-    lat = row.get('latitude')
-    lon = row.get('longitude')
+    if not os.path.exists(output_file):
+        return 0
+    
+    try:
+        completed = pd.read_csv(output_file, engine='pyarrow', dtype_backend='pyarrow')
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        return 0
     
-    # Check if either is NaN, None, or empty string
-    lat_missing = pd.isna(lat) or (isinstance(lat, str) and not lat.strip())
-    lon_missing = pd.isna(lon) or (isinstance(lon, str) and not lon.strip())
+    if list(completed.columns) != list(df.columns) or not 0 < len(completed) < len(df):
+        return 0
     
-    return lat_missing or lon_missing
+    completed.index = df.index[:len(completed)]
+    normalize_result_columns(completed)
+    
+    # Make sure the output was written from this input file
+    for column in df.columns:
+        if column in RESULT_COLUMNS:
+            continue
+        try:
+            written = completed[[column]].astype({column: df[column].dtype})
+        except (TypeError, ValueError):
+            matches = False
+        else:
+            matches = column_text(written, column).equals(column_text(df.loc[completed.index], column))
+        if not matches:
+            print(f"⚠️  {output_file} doesn't match the input file - starting over")
+            return 0
+    
+    for column in df.columns:
+        df.loc[completed.index, column] = completed[column].to_numpy()
+    
+    return len(completed)
 
-def is_too_vague(row: pd.Series) -> bool:
+async def geocode_and_save(df: pd.DataFrame, needs_geocoding: pd.Series, resumed_count: int,
+                           output_file: str, api_key: str) -> Tuple[int, int, int]:
     """
-    Check if location is too vague (county-only or state-only).
-    For ~20mi accuracy (10mi radius), we need at least city-level data.
+    Geocode the rows of df flagged in needs_geocoding CHUNK_SIZE rows at a
+    time, appending each finished chunk to output_file.
+    
+    All chunks share one HTTP session, so keep-alive connections are reused
+    for the whole run.
+    
+    Returns:
+        Tuple of (geocoded_count, skipped_vague, failed_count)
     """
-    has_city = pd.notna(row.get('city')) and str(row['city']).strip()
-    has_prec_location = pd.notna(row.get('prec_location')) and str(row['prec_location']).strip()
+    geocoded_count = 0
+    skipped_vague = 0
+    failed_count = 0
+    
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        out = None
+        try:
+            for start in range(resumed_count, len(df), CHUNK_SIZE):
+                chunk = df.index[start:start + CHUNK_SIZE]
+                rows = chunk[needs_geocoding[chunk].to_numpy()]
+                if len(rows):
+                    chunk_geocoded, chunk_skipped, chunk_failed = await geocode_rows(df, rows, session, api_key)
+                    geocoded_count += chunk_geocoded
+                    skipped_vague += chunk_skipped
+                    failed_count += chunk_failed
+                
+                # Only open (and truncate) the output once the first chunk is done,
+                # so a run that fails before then leaves the existing file alone
+                if out is None:
+                    out = open(output_file, 'a' if resumed_count else 'w', newline='', buffering=1024 * 1024)
+                    if not resumed_count:
+                        df.iloc[:0].to_csv(out, index=False)
+                
+                df.loc[chunk].to_csv(out, header=False, index=False)
+                out.flush()
+        finally:
+            if out is not None:
+                out.close()
     
-    # If we have city or precise location, it's specific enough
-    return not (has_city or has_prec_location)
+    return geocoded_count, skipped_vague, failed_count
 
 def main():
     # Check if command line arguments are provided, otherwise use configured paths
@@ -436,50 +838,19 @@ def main():
     print(f"📂 Reading data from: {input_file}")
     
     try:
-        df = pd.read_csv(input_file)
+        df = read_input_csv(input_file)
     except FileNotFoundError:
         print(f"❌ Error: File '{input_file}' not found")
         sys.exit(1)
     
     print(f"✅ Loaded {len(df)} rows")
     
-    # Convert latitude and longitude columns to numeric type
-    if 'latitude' in df.columns:
-        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-    else:
-        df['latitude'] = pd.NA
-    
-    if 'longitude' in df.columns:
-        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
-    else:
-        df['longitude'] = pd.NA
-    
-    # Add columns for tracking geocoding results if they don't exist
-    if 'geocoded_address' not in df.columns:
-        df['geocoded_address'] = ''
-    if 'google_formatted_address' not in df.columns:
-        df['google_formatted_address'] = ''
-    if 'location_type' not in df.columns:
-        df['location_type'] = ''
-    if 'flag_status' not in df.columns:
-        df['flag_status'] = ''
-    if 'flag_reason' not in df.columns:
-        df['flag_reason'] = ''
-    
-    # Add columns for offset-corrected coordinates
-    if 'latitude_shifted' not in df.columns:
-        df['latitude_shifted'] = pd.NA
-    if 'longitude_shifted' not in df.columns:
-        df['longitude_shifted'] = pd.NA
-    if 'offset_applied' not in df.columns:
-        df['offset_applied'] = ''
+    # Add columns for tracking geocoding results, with writable dtypes
+    normalize_result_columns(df)
     
     # PRE-PROCESSING: Flag all rows for potential issues
     print("\n🔍 Pre-processing: Flagging potential issues...")
-    for idx, row in df.iterrows():
-        flag_status, flag_reason = flag_potential_issues(row)
-        df.at[idx, 'flag_status'] = flag_status
-        df.at[idx, 'flag_reason'] = flag_reason
+    df['flag_status'], df['flag_reason'] = flag_potential_issues(df)
     
     # Show flagging summary
     flag_counts = df['flag_status'].value_counts()
@@ -497,8 +868,9 @@ def main():
     if flag_counts.get('WARNING', 0) > 0:
         print("\n⚠️  WARNING flagged locations:")
         warning_rows = df[df['flag_status'] == 'WARNING']
+        warning_addresses = construct_addresses(warning_rows)
         for idx, row in warning_rows.iterrows():
-            location_desc = construct_address(row) or "No address"
+            location_desc = warning_addresses[idx] or "No address"
             print(f"    Row {idx}: {location_desc}")
             print(f"           {row['flag_reason']}")
     
@@ -507,18 +879,25 @@ def main():
     
     print()
     
+    # Pick up rows finished by a previous interrupted run
+    resumed_count = load_completed_rows(df, output_file)
+    if resumed_count:
+        print(f"♻️  Resuming: {resumed_count} rows already saved in {output_file}")
+    
     # Count how many need geocoding
-    needs_geocoding = df.apply(should_geocode, axis=1)
+    # latitude/longitude are numeric by now, so blanks are already NaN
+    needs_geocoding = df['latitude'].isna() | df['longitude'].isna()
+    needs_geocoding.iloc[:resumed_count] = False
     total_to_geocode = needs_geocoding.sum()
     
     print(f"\n🎯 Found {total_to_geocode} locations that need geocoding")
     
-    if total_to_geocode == 0:
+    if total_to_geocode == 0 and not resumed_count:
         print("✨ All locations already have coordinates!")
         return
     
     # Check API key
-    if GOOGLE_API_KEY == "YOUR_GOOGLE_API_KEY_HERE" or not GOOGLE_API_KEY:
+    if total_to_geocode > 0 and (GOOGLE_API_KEY == "YOUR_GOOGLE_API_KEY_HERE" or not GOOGLE_API_KEY):
         print("\n⚠️  WARNING: Google API key not set!")
         print("   Set your API key using one of these methods:")
         print("")
@@ -535,135 +914,12 @@ def main():
         print("")
         sys.exit(1)
     
-    # Process each row
-    geocoded_count = 0
-    skipped_vague = 0
-    failed_count = 0
-    
-    for idx, row in df[needs_geocoding].iterrows():
-        # Check if too vague
-        if is_too_vague(row):
-            print(f"\n⏭️  Row {idx}: Skipping (too vague - county/state only)")
-            skipped_vague += 1
-            continue
-        
-        # Construct address
-        address = construct_address(row)
-        
-        if not address:
-            print(f"\n⏭️  Row {idx}: Skipping (no address data)")
-            skipped_vague += 1
-            continue
-        
-        print(f"\n🔍 Row {idx}: Geocoding '{address}'")
-        
-        # Extract base location (remove directional offset for geocoding)
-        base_address = extract_base_location(address)
-        if base_address != address:
-            print(f"  📍 Extracted base location: '{base_address}'")
-        
-        # Geocode the base location
-        lat, lon, location_type, formatted_address = geocode_address_google(base_address, GOOGLE_API_KEY)
-        
-        if lat and lon:
-            df.at[idx, 'latitude'] = lat
-            df.at[idx, 'longitude'] = lon
-            df.at[idx, 'geocoded_address'] = address
-            df.at[idx, 'google_formatted_address'] = formatted_address
-            df.at[idx, 'location_type'] = location_type
-            
-            # Check for directional offset and apply if found
-            prec_location = str(row.get('prec_location', '')).strip()
-            if prec_location:
-                distance, bearing = parse_directional_offset(prec_location)
-                if distance and bearing:
-                    # Calculate shifted coordinates
-                    lat_shifted, lon_shifted = apply_offset(lat, lon, distance, bearing)
-                    df.at[idx, 'latitude_shifted'] = lat_shifted
-                    df.at[idx, 'longitude_shifted'] = lon_shifted
-                    df.at[idx, 'offset_applied'] = f"{distance}mi at {bearing}°"
-                    
-                    print(f"  🧭 Directional offset detected: {distance}mi at {bearing}° bearing")
-                    print(f"     Base coords: {lat:.6f}, {lon:.6f}")
-                    print(f"     Shifted coords: {lat_shifted:.6f}, {lon_shifted:.6f}")
-            
-            # Add post-geocoding flags
-            post_flags = []
-            
-            # Only flag GEOMETRIC_CENTER (not APPROXIMATE - that's very common and fine)
-            if location_type == "GEOMETRIC_CENTER":
-                post_flags.append("Geometric center of area")
-            
-            # Check if Google returned a very different location
-            if formatted_address:
-                formatted_lower = formatted_address.lower()
-                
-                # Check if state matches (if we have one)
-                if pd.notna(row.get('province_state')):
-                    expected_state = str(row['province_state']).strip()
-                    expected_state_lower = expected_state.lower()
-                    
-                    # State abbreviation mapping
-                    state_abbrev = {
-                        'alabama': 'al', 'alaska': 'ak', 'arizona': 'az', 'arkansas': 'ar',
-                        'california': 'ca', 'colorado': 'co', 'connecticut': 'ct', 'delaware': 'de',
-                        'florida': 'fl', 'georgia': 'ga', 'hawaii': 'hi', 'idaho': 'id',
-                        'illinois': 'il', 'indiana': 'in', 'iowa': 'ia', 'kansas': 'ks',
-                        'kentucky': 'ky', 'louisiana': 'la', 'maine': 'me', 'maryland': 'md',
-                        'massachusetts': 'ma', 'michigan': 'mi', 'minnesota': 'mn', 'mississippi': 'ms',
-                        'missouri': 'mo', 'montana': 'mt', 'nebraska': 'ne', 'nevada': 'nv',
-                        'new hampshire': 'nh', 'new jersey': 'nj', 'new mexico': 'nm', 'new york': 'ny',
-                        'north carolina': 'nc', 'north dakota': 'nd', 'ohio': 'oh', 'oklahoma': 'ok',
-                        'oregon': 'or', 'pennsylvania': 'pa', 'rhode island': 'ri', 'south carolina': 'sc',
-                        'south dakota': 'sd', 'tennessee': 'tn', 'texas': 'tx', 'utah': 'ut',
-                        'vermont': 'vt', 'virginia': 'va', 'washington': 'wa', 'west virginia': 'wv',
-                        'wisconsin': 'wi', 'wyoming': 'wy'
-                    }
-                    
-                    # Check if either full name or abbreviation appears in result
-                    state_found = (
-                        expected_state_lower in formatted_lower or
-                        state_abbrev.get(expected_state_lower, '') in formatted_lower
-                    )
-                    
-                    if expected_state and not state_found:
-                        post_flags.append(f"State mismatch (expected {expected_state})")
-                
-                # Check if country is unexpected
-                if 'india' in formatted_lower or 'uk' in formatted_lower or 'canada' in formatted_lower:
-                    if 'usa' not in formatted_lower and 'united states' not in formatted_lower:
-                        post_flags.append("UNEXPECTED COUNTRY - verify result!")
-            
-            # Update flags if we found post-geocoding issues
-            if post_flags:
-                existing_flags = df.at[idx, 'flag_reason']
-                if existing_flags:
-                    df.at[idx, 'flag_reason'] = existing_flags + "; " + "; ".join(post_flags)
-                else:
-                    df.at[idx, 'flag_reason'] = "; ".join(post_flags)
-                
-                # Upgrade status if we found serious issues
-                if any("UNEXPECTED COUNTRY" in f or "State mismatch" in f for f in post_flags):
-                    df.at[idx, 'flag_status'] = "WARNING"
-                elif df.at[idx, 'flag_status'] == "OK":
-                    df.at[idx, 'flag_status'] = "REVIEW"
-            
-            print(f"  ✅ Success: {lat}, {lon}")
-            print(f"  📍 Google says: {formatted_address}")
-            print(f"  🎯 Accuracy: {location_type}")
-            if post_flags:
-                print(f"  🚩 Post-geocoding flags: {'; '.join(post_flags)}")
-            geocoded_count += 1
-        else:
-            print(f"  ❌ Failed to geocode")
-            failed_count += 1
-        
-        # Rate limiting
-        time.sleep(RATE_LIMIT_DELAY)
-    
-    # Save results
-    print(f"\n💾 Saving results to: {output_file}")
-    df.to_csv(output_file, index=False)
+    # Geocode in chunks, appending each finished chunk to the output file
+    # so an interrupted run keeps its progress
+    print(f"\n💾 Writing results to: {output_file}")
+    geocoded_count, skipped_vague, failed_count = asyncio.run(
+        geocode_and_save(df, needs_geocoding, resumed_count, output_file, GOOGLE_API_KEY)
+    )
     
     # Summary
     print("\n" + "="*50)
@@ -673,7 +929,9 @@ def main():
     print(f"Successfully geocoded:   {geocoded_count}")
     print(f"Skipped (too vague):     {skipped_vague}")
     print(f"Failed:                  {failed_count}")
-    print(f"Already had coordinates: {len(df) - total_to_geocode}")
+    print(f"Already had coordinates: {len(df) - total_to_geocode - resumed_count}")
+    if resumed_count:
+        print(f"Resumed from last run:   {resumed_count}")
     
     # Count offset applications
     offset_count = df['offset_applied'].notna().sum() if 'offset_applied' in df.columns else 0